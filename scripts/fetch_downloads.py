@@ -2,19 +2,36 @@
 """Fetch daily traction metrics from PyPI, npm, and GitHub and append to CSV."""
 
 import csv
+import hashlib
 import os
+import pickle
 import sys
-from collections import defaultdict
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 from typing import Dict, List
 
-import requests
+import orjson
 import yaml
+from requests.adapters import HTTPAdapter
+from requests_cache import DO_NOT_CACHE, CachedSession
+from urllib3.util.retry import Retry
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CONFIG_PATH = os.path.join(ROOT_DIR, "config.yaml")
 DATA_DIR = os.path.join(ROOT_DIR, "data")
 CSV_PATH = os.path.join(DATA_DIR, "downloads.csv")
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache")
+HTTP_CACHE_PATH = os.path.join(CACHE_DIR, "http")
+# Pickled load_existing_data() result, reused while the CSV is unchanged.
+INDEX_PATH = os.path.join(CACHE_DIR, "downloads.index.pkl")
 
 CSV_HEADERS = ["date", "package", "source", "downloads"]
 
@@ -23,83 +40,192 @@ CSV_HEADERS = ["date", "package", "source", "downloads"]
 # may later have real values.
 RECENCY_DAYS = 7
 
+# Upper bound on in-flight HTTP requests when fetching packages concurrently.
+MAX_WORKERS = 10
+
+# Shared session so repeated calls to the same host (GitHub pagination, Discord
+# channel scans) reuse pooled keep-alive connections instead of a fresh TLS
+# handshake per request. Transient 429/5xx GET responses are retried with
+# exponential backoff (honouring Retry-After) rather than dropping the package
+# for the day.
+#
+# Public pypistats/npm GET responses are cached on disk for an hour, so reruns
+# replay them without network access; expired entries are revalidated with
+# ETag/Last-Modified. Lifetimes are set here rather than taken from
+# Cache-Control, which would override them (GitHub sends max-age=60).
+#
+# pypistats publishes once a day, so its history is kept for 12 hours: long
+# enough for same-day reruns, short enough that the next daily run refetches.
+#
+# GitHub and Discord are never cached: their responses are token-authenticated
+# (private repos, traffic, guild messages) and the cache directory is shared
+# through the Actions cache. They are also the snapshot sources, where a stale
+# copy would be recorded as today's value, so a failed refresh is never
+# answered from the cache either.
+HTTP_CACHE_EXPIRY_BY_URL = {
+    "pypistats.org/api/packages/*": 12 * 3600,
+    "api.github.com": DO_NOT_CACHE,
+    "discord.com": DO_NOT_CACHE,
+}
+SESSION = CachedSession(
+    HTTP_CACHE_PATH,
+    expire_after=3600,
+    urls_expire_after=HTTP_CACHE_EXPIRY_BY_URL,
+    allowable_methods=("GET",),
+)
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+        ),
+    ),
+)
+
 
 def load_config():
     with open(CONFIG_PATH) as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YamlLoader)
+
+
+def csv_signature():
+    """Return (size, blake2b digest) of the CSV, used to validate the sidecar index.
+
+    Keyed on content rather than mtime, since a fresh checkout gives the CSV a
+    new mtime on every CI run.
+    """
+    with open(CSV_PATH, "rb") as f:
+        content = f.read()
+    return len(content), hashlib.blake2b(content, digest_size=16).digest()
+
+
+def save_existing_index(data):
+    """Atomically write the existing-entries index next to the current CSV signature."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = INDEX_PATH + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump((csv_signature(), data), f, protocol=5)
+    os.replace(tmp_path, INDEX_PATH)
 
 
 def load_existing_data():
-    """Return a dict mapping (date, package, source) → downloads for all rows."""
-    data = {}
+    """Return a dict mapping (package, source) → {date: downloads} for all rows.
+
+    Served from the sidecar index when it matches the CSV's size and content hash;
+    otherwise the CSV is parsed and the index rewritten.
+    """
     if not os.path.exists(CSV_PATH):
-        return data
+        return defaultdict(dict)
+    try:
+        with open(INDEX_PATH, "rb") as f:
+            signature, data = pickle.load(f)
+        if signature == csv_signature():
+            return data
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+    data = parse_existing_csv()
+    save_existing_index(data)
+    return data
+
+
+def parse_existing_csv():
+    """Parse the CSV into the load_existing_data() layout.
+
+    Date strings are interned, so every series shares one str object per day.
+    """
+    data = defaultdict(dict)
     with open(CSV_PATH, newline="") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return data
+        di, pi, si, dli = (header.index(column) for column in CSV_HEADERS)
+        intern = sys.intern
         for row in reader:
-            key = (row["date"], row["package"], row["source"])
-            data[key] = int(row["downloads"])
+            data[(row[pi], row[si])][intern(row[di])] = int(row[dli])
     return data
 
 
-def rewrite_csv_with_updates(updates: Dict[tuple, int]):
+def rewrite_csv_with_updates(updates: Dict[tuple, int], new_rows=()):
     """Overwrite specific rows in the CSV with new download counts.
 
     updates: mapping of (date, package, source) → new downloads value
+    new_rows: (date, package, source, downloads) tuples appended in the same
+        pass, so a run with both updates and new data writes the file once
+
+    The new contents are written to a temporary file and swapped in with
+    os.replace, so an interrupted run never leaves a truncated CSV.
     """
     if not updates or not os.path.exists(CSV_PATH):
         return
     rows = []
     with open(CSV_PATH, newline="") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader)
+        di, pi, si, dli = (header.index(column) for column in CSV_HEADERS)
         for row in reader:
-            key = (row["date"], row["package"], row["source"])
-            if key in updates:
-                row["downloads"] = str(updates[key])
-            rows.append(row)
-    with open(CSV_PATH, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-        writer.writeheader()
+            key = (row[di], row[pi], row[si])
+            rows.append((*key, updates.get(key, row[dli])))
+    tmp_path = CSV_PATH + ".tmp"
+    with open(tmp_path, "w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADERS)
         writer.writerows(rows)
+        writer.writerows(new_rows)
+    os.replace(tmp_path, CSV_PATH)
 
 
 def fetch_pypi_downloads(package):
     """Fetch all available daily download counts from pypistats.org."""
     url = f"https://pypistats.org/api/packages/{package}/overall"
     try:
-        resp = requests.get(url, timeout=30)
+        resp = SESSION.get(url, timeout=30)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except Exception as e:
         print(f"  [ERROR] PyPI fetch failed for {package}: {e}")
         return []
 
-    results = []
-    for entry in data.get("data", []):
-        if entry.get("category") == "with_mirrors":
-            results.append({"date": entry["date"], "downloads": entry["downloads"]})
+    results = [
+        {"date": entry["date"], "downloads": entry["downloads"]}
+        for entry in data.get("data", [])
+        if entry.get("category") == "with_mirrors"
+    ]
 
     if not results:
         print(f"  [WARN] No download data found for PyPI package: {package}")
     return results
 
 
-def fetch_npm_downloads(package):
-    """Fetch the last 365 days of daily download counts from npm registry."""
+def fetch_npm_downloads(package, start_date=None):
+    """Fetch daily download counts from npm registry, ending yesterday.
+
+    The range starts at start_date, or 365 days back when start_date is None
+    or earlier than that.
+    """
     end = date.today() - timedelta(days=1)
     start = end - timedelta(days=364)
+    if start_date is not None and start_date > start:
+        start = start_date
     url = f"https://api.npmjs.org/downloads/range/{start.isoformat()}:{end.isoformat()}/{package}"
     try:
-        resp = requests.get(url, timeout=30)
+        resp = SESSION.get(url, timeout=30)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except Exception as e:
         print(f"  [ERROR] npm fetch failed for {package}: {e}")
         return []
 
-    results = []
-    for entry in data.get("downloads", []):
-        results.append({"date": entry["day"], "downloads": entry["downloads"]})
+    results = [
+        {"date": entry["day"], "downloads": entry["downloads"]}
+        for entry in data.get("downloads", [])
+    ]
 
     if not results:
         print(f"  [WARN] No download data found for npm package: {package}")
@@ -145,14 +271,68 @@ def github_headers():
     return headers
 
 
+# Attempts, and the longest wait worth sleeping through, when GitHub reports a
+# rate limit. Longer waits (a primary limit can take up to an hour to reset)
+# fail the request straight away.
+GITHUB_MAX_ATTEMPTS = 5
+GITHUB_MAX_RETRY_WAIT = 60
+
+
+def is_rate_limited(resp):
+    """Return True for GitHub primary (403 + remaining 0) or secondary rate limits.
+
+    A 429 only reaches here for POSTs (GraphQL): for GETs the session's urllib3
+    Retry policy handles 429 itself and raises RetryError once it gives up.
+    """
+    if resp.status_code == 429:
+        return True
+    return resp.status_code == 403 and (
+        resp.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in resp.headers
+    )
+
+
+def rate_limit_wait(resp):
+    """Seconds GitHub asks us to wait, from Retry-After or X-RateLimit-Reset."""
+    retry_after = resp.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return int(retry_after)
+    reset = resp.headers.get("X-RateLimit-Reset", "")
+    if reset.isdigit():
+        return max(0.0, int(reset) - time.time())
+    return None
+
+
+def github_request(method, url, **kwargs):
+    """Send a GitHub API request, sleeping through rate limits before retrying.
+
+    Waits follow Retry-After / X-RateLimit-Reset (exponential backoff when
+    neither is present). If GitHub asks for more than GITHUB_MAX_RETRY_WAIT
+    seconds, or attempts run out, the rate-limited response is returned.
+    """
+    kwargs.setdefault("timeout", 30)
+    for attempt in range(GITHUB_MAX_ATTEMPTS):
+        resp = SESSION.request(method, url, **kwargs)
+        if not is_rate_limited(resp) or attempt == GITHUB_MAX_ATTEMPTS - 1:
+            return resp
+        delay = rate_limit_wait(resp)
+        if delay is None:
+            delay = 2 ** attempt
+        elif delay > GITHUB_MAX_RETRY_WAIT:
+            print(f"  [WARN] GitHub rate limit hit for {url}, resets in {delay:.0f}s; not waiting")
+            return resp
+        print(f"  [WARN] GitHub rate limit hit for {url}, retrying in {delay:.0f}s")
+        time.sleep(delay)
+    return resp
+
+
 def fetch_github_user_login(headers):
     """Return authenticated user login when a GitHub token is provided."""
     if "Authorization" not in headers:
         return None
     try:
-        resp = requests.get("https://api.github.com/user", headers=headers, timeout=30)
+        resp = github_request("GET", "https://api.github.com/user", headers=headers)
         resp.raise_for_status()
-        return resp.json().get("login")
+        return orjson.loads(resp.content).get("login")
     except Exception as e:
         print(f"  [WARN] Could not resolve authenticated GitHub user: {e}")
         return None
@@ -166,11 +346,11 @@ def fetch_github_paginated(endpoint, headers, params):
         page_params = dict(params)
         page_params["page"] = page
         page_params["per_page"] = 100
-        resp = requests.get(endpoint, headers=headers, params=page_params, timeout=30)
+        resp = github_request("GET", endpoint, headers=headers, params=page_params)
         if resp.status_code == 404:
             return None
         resp.raise_for_status()
-        batch = resp.json()
+        batch = orjson.loads(resp.content)
         if not isinstance(batch, list):
             break
         all_items.extend(batch)
@@ -187,7 +367,8 @@ def fetch_repos_for_owner(owner, headers, viewer_login=None):
     For authenticated requests where owner is the token owner, use /user/repos
     to include private repositories.
     """
-    if viewer_login and viewer_login.lower() == owner.lower():
+    owner_lc = owner.lower()
+    if viewer_login and viewer_login.lower() == owner_lc:
         endpoint = "https://api.github.com/user/repos"
         params = {"type": "owner", "sort": "full_name", "direction": "asc"}
         repos = fetch_github_paginated(endpoint, headers, params)
@@ -195,7 +376,8 @@ def fetch_repos_for_owner(owner, headers, viewer_login=None):
             repos = [
                 repo
                 for repo in repos
-                if repo.get("owner", {}).get("login", "").lower() == owner.lower()
+                if (repo_owner := repo.get("owner"))
+                and repo_owner.get("login", "").lower() == owner_lc
             ]
             return repos
 
@@ -216,9 +398,120 @@ def fetch_repos_for_owner(owner, headers, viewer_login=None):
 def fetch_repo_by_full_name(full_name, headers):
     """Fetch a single repository by full name (owner/repo)."""
     url = f"https://api.github.com/repos/{full_name}"
-    resp = requests.get(url, headers=headers, timeout=30)
+    resp = github_request("GET", url, headers=headers)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+# Repositories per aliased query, kept well under GraphQL's node limits.
+GITHUB_GRAPHQL_BATCH_SIZE = 80
+
+# Repository fields needed for the stars/forks/open-issues rows. Open pull
+# requests are fetched too because REST's open_issues_count includes them.
+GITHUB_REPO_STATS_FRAGMENT = """
+fragment RepoStats on Repository {
+  nameWithOwner
+  stargazerCount
+  forkCount
+  issues(states: OPEN) { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+}
+"""
+
+GITHUB_OWNER_REPOS_QUERY = """
+query($login: String!, $cursor: String) {
+  repositoryOwner(login: $login) {
+    repositories(first: 100, after: $cursor, ownerAffiliations: [OWNER]) {
+      nodes { ...RepoStats }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+""" + GITHUB_REPO_STATS_FRAGMENT
+
+
+def github_graphql(query, headers, variables=None):
+    """Run a GitHub GraphQL query and return its data object.
+
+    Raises if the request fails or the response carries errors but no data;
+    partial results (e.g. one missing repository) are returned as-is.
+    """
+    resp = github_request(
+        "POST",
+        GITHUB_GRAPHQL_URL,
+        headers={**headers, "Content-Type": "application/json"},
+        data=orjson.dumps({"query": query, "variables": variables or {}}),
+    )
     resp.raise_for_status()
-    return resp.json()
+    payload = orjson.loads(resp.content)
+    data = payload.get("data")
+    if not data and payload.get("errors"):
+        raise RuntimeError(payload["errors"][0].get("message", "GraphQL query failed"))
+    return data or {}
+
+
+def repo_from_graphql(node):
+    """Convert a RepoStats GraphQL node into the REST repository fields used here."""
+    return {
+        "full_name": node["nameWithOwner"],
+        "stargazers_count": node["stargazerCount"],
+        "forks_count": node["forkCount"],
+        "open_issues_count": node["issues"]["totalCount"] + node["pullRequests"]["totalCount"],
+    }
+
+
+def fetch_repos_for_owner_graphql(owner, headers):
+    """Fetch all repos owned by a user or org via GraphQL, 100 per request."""
+    repos = []
+    cursor = None
+    while True:
+        data = github_graphql(GITHUB_OWNER_REPOS_QUERY, headers, {"login": owner, "cursor": cursor})
+        repo_owner = data.get("repositoryOwner")
+        if repo_owner is None:
+            raise RuntimeError(f"Owner '{owner}' not found as a GitHub user or org")
+        connection = repo_owner["repositories"]
+        repos.extend(repo_from_graphql(node) for node in connection["nodes"] if node)
+        if not connection["pageInfo"]["hasNextPage"]:
+            return repos
+        cursor = connection["pageInfo"]["endCursor"]
+
+
+def fetch_github_repo_stats_graphql(full_names, headers):
+    """Fetch repositories with aliased GraphQL queries, GITHUB_GRAPHQL_BATCH_SIZE per request.
+
+    Returns a dict of full_name → repo. Repositories that could not be
+    resolved, or whose batch failed, are left out for the caller to retry.
+    """
+    # Malformed names are left for the REST fallback to report per repo.
+    full_names = [full_name for full_name in full_names if full_name.count("/") == 1]
+    repos = {}
+    for offset in range(0, len(full_names), GITHUB_GRAPHQL_BATCH_SIZE):
+        batch = full_names[offset:offset + GITHUB_GRAPHQL_BATCH_SIZE]
+        params = []
+        fields = []
+        variables = {}
+        for i, full_name in enumerate(batch):
+            owner, name = full_name.split("/", 1)
+            params.append(f"$o{i}: String!, $n{i}: String!")
+            fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoStats }}")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+        query = (
+            f"query({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}\n"
+            + GITHUB_REPO_STATS_FRAGMENT
+        )
+        try:
+            data = github_graphql(query, headers, variables)
+        except Exception as e:
+            print(f"  [WARN] GraphQL batch of {len(batch)} repo(s) failed: {e}")
+            continue
+
+        for i, full_name in enumerate(batch):
+            node = data.get(f"r{i}")
+            if node:
+                repos[full_name] = repo_from_graphql(node)
+    return repos
 
 
 def fetch_github_repo_clones(full_name, headers):
@@ -232,13 +525,13 @@ def fetch_github_repo_clones(full_name, headers):
     """
     url = f"https://api.github.com/repos/{full_name}/traffic/clones"
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
+        resp = github_request("GET", url, headers=headers)
         if resp.status_code in (403, 404):
             print(f"  [WARN] /traffic/clones not accessible for {full_name} "
                   f"(status {resp.status_code}); token likely lacks push access")
             return []
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except Exception as e:
         print(f"  [ERROR] GitHub clones fetch failed for {full_name}: {e}")
         return []
@@ -257,7 +550,8 @@ def fetch_github_repo_stats(config):
     """
     Fetch GitHub repo traction metrics.
 
-    Returns rows in the same schema as CSV_HEADERS with these source values:
+    Returns (date, package, source, downloads) tuples in CSV_HEADERS order with
+    these source values:
     - github_stars
     - github_forks
     - github_open_issues
@@ -269,61 +563,91 @@ def fetch_github_repo_stats(config):
         return []
 
     headers = github_headers()
-    viewer_login = fetch_github_user_login(headers)
+    # The GraphQL API always requires a token; without one, use REST.
+    use_graphql = "Authorization" in headers
     today = date.today().isoformat()
 
     repos_by_name: Dict[str, dict] = {}
+    rows = []
 
-    for owner in owners:
-        print(f"Fetching GitHub repos for owner: {owner}")
-        try:
-            repos = fetch_repos_for_owner(owner, headers, viewer_login)
-        except Exception as e:
-            print(f"  [ERROR] GitHub repo listing failed for owner {owner}: {e}")
-            continue
-
-        for repo in repos:
-            full_name = repo.get("full_name")
-            if full_name:
-                repos_by_name[full_name] = repo
-        print(f"  -> {len(repos)} repos discovered")
+    # Owners, REST repo lookups and clone traffic are independent requests, so
+    # each stage is fanned out across the pool.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # Owners are listed via GraphQL when possible; any that fail (or all of
+        # them, without a token) fall back to REST, which needs the viewer login.
+        owner_futures = {}
+        rest_owners = owners
+        if use_graphql:
+            graphql_futures = [
+                executor.submit(fetch_repos_for_owner_graphql, owner, headers) for owner in owners
+            ]
+            rest_owners = []
+            for owner, future in zip(owners, graphql_futures):
+                if future.exception() is None:
+                    owner_futures[owner] = future
+                else:
+                    print(
+                        f"  [WARN] GraphQL repo listing failed for owner {owner}, "
+                        f"using REST: {future.exception()}"
+                    )
+                    rest_owners.append(owner)
+        if rest_owners:
+            viewer_login = fetch_github_user_login(headers)
+            for owner in rest_owners:
+                owner_futures[owner] = executor.submit(
+                    fetch_repos_for_owner, owner, headers, viewer_login
+                )
 
-    for full_name in explicit_repos:
-        if full_name in repos_by_name:
-            continue
-        print(f"Fetching GitHub repo: {full_name}")
-        try:
-            repo = fetch_repo_by_full_name(full_name, headers)
-            repos_by_name[full_name] = repo
-        except Exception as e:
-            print(f"  [ERROR] GitHub fetch failed for repo {full_name}: {e}")
+        for owner in owners:
+            print(f"GitHub repos for owner: {owner}")
+            try:
+                repos = owner_futures[owner].result()
+            except Exception as e:
+                print(f"  [ERROR] GitHub repo listing failed for owner {owner}: {e}")
+                continue
 
-    rows = []
-    for full_name, repo in sorted(repos_by_name.items()):
-        stars = int(repo.get("stargazers_count", 0))
-        forks = int(repo.get("forks_count", 0))
-        open_issues = int(repo.get("open_issues_count", 0))
-        rows.extend([
-            {"date": today, "package": full_name, "source": "github_stars", "downloads": stars},
-            {"date": today, "package": full_name, "source": "github_forks", "downloads": forks},
-            {
-                "date": today,
-                "package": full_name,
-                "source": "github_open_issues",
-                "downloads": open_issues,
-            },
-        ])
-
-        clone_entries = fetch_github_repo_clones(full_name, headers)
-        for entry in clone_entries:
-            rows.append({
-                "date": entry["date"],
-                "package": full_name,
-                "source": "github_clones",
-                "downloads": entry["downloads"],
-            })
-        if clone_entries:
-            print(f"  -> {len(clone_entries)} day(s) of clone data for {full_name}")
+            for repo in repos:
+                full_name = repo.get("full_name")
+                if full_name:
+                    repos_by_name[full_name] = repo
+            print(f"  -> {len(repos)} repos discovered")
+
+        pending = [full_name for full_name in explicit_repos if full_name not in repos_by_name]
+        if pending and use_graphql:
+            print(f"Fetching {len(pending)} GitHub repo(s) via GraphQL")
+            repos_by_name.update(fetch_github_repo_stats_graphql(pending, headers))
+            pending = [full_name for full_name in pending if full_name not in repos_by_name]
+
+        repo_futures = [
+            executor.submit(fetch_repo_by_full_name, full_name, headers) for full_name in pending
+        ]
+        for full_name, future in zip(pending, repo_futures):
+            print(f"GitHub repo: {full_name}")
+            try:
+                repos_by_name[full_name] = future.result()
+            except Exception as e:
+                print(f"  [ERROR] GitHub fetch failed for repo {full_name}: {e}")
+
+        full_names = sorted(repos_by_name)
+        clone_futures = [
+            executor.submit(fetch_github_repo_clones, full_name, headers) for full_name in full_names
+        ]
+        for full_name, future in zip(full_names, clone_futures):
+            repo = repos_by_name[full_name]
+            stars = int(repo.get("stargazers_count", 0))
+            forks = int(repo.get("forks_count", 0))
+            open_issues = int(repo.get("open_issues_count", 0))
+            rows.extend([
+                (today, full_name, "github_stars", stars),
+                (today, full_name, "github_forks", forks),
+                (today, full_name, "github_open_issues", open_issues),
+            ])
+
+            clone_entries = future.result()
+            for entry in clone_entries:
+                rows.append((entry["date"], full_name, "github_clones", entry["downloads"]))
+            if clone_entries:
+                print(f"  -> {len(clone_entries)} day(s) of clone data for {full_name}")
 
     print(f"Collected GitHub stats for {len(repos_by_name)} repo(s)")
     return rows
@@ -331,6 +655,18 @@ def fetch_github_repo_stats(config):
 
 DISCORD_EPOCH = 1420070400000
 
+# Discord allows 50 requests/second per bot; stay a little under that when
+# scanning channels in parallel.
+DISCORD_MAX_REQUESTS_PER_SECOND = 45
+DISCORD_MAX_WORKERS = 8
+
+MS_PER_DAY = 86_400_000
+_UNIX_EPOCH_DATE = date(1970, 1, 1)
+_snowflake_day_cache: Dict[int, date] = {}
+
+_discord_rate_lock = threading.Lock()
+_discord_next_request_at = 0.0
+
 
 def discord_headers():
     """Build Discord Bot API headers."""
@@ -341,19 +677,89 @@ def discord_headers():
 
 
 def snowflake_from_datetime(dt):
-    """Convert a datetime to a Discord snowflake ID."""
+    """Convert a datetime (or a date, taken as UTC midnight) to a Discord snowflake ID."""
     import datetime as _dt
     if isinstance(dt, date) and not isinstance(dt, _dt.datetime):
-        dt = _dt.datetime.combine(dt, _dt.time.min)
-    ts_ms = int(dt.timestamp() * 1000)
+        ts_ms = (dt - _UNIX_EPOCH_DATE).days * MS_PER_DAY
+    else:
+        ts_ms = int(dt.timestamp() * 1000)
     return (ts_ms - DISCORD_EPOCH) << 22
 
 
 def date_from_snowflake(snowflake_id):
-    """Extract a date from a Discord snowflake ID."""
-    import datetime as _dt
+    """Extract the (UTC) date from a Discord snowflake ID.
+
+    Uses integer day arithmetic with a per-day cache instead of building a
+    datetime per message.
+    """
     ts_ms = (int(snowflake_id) >> 22) + DISCORD_EPOCH
-    return _dt.datetime.fromtimestamp(ts_ms / 1000).date()
+    day = ts_ms // MS_PER_DAY
+    d = _snowflake_day_cache.get(day)
+    if d is None:
+        d = _UNIX_EPOCH_DATE + timedelta(days=day)
+        _snowflake_day_cache[day] = d
+    return d
+
+
+def discord_get(url, headers, **kwargs):
+    """GET a Discord API URL, spacing calls to respect the global bot rate limit."""
+    global _discord_next_request_at
+    with _discord_rate_lock:
+        now = time.monotonic()
+        start_at = max(now, _discord_next_request_at)
+        _discord_next_request_at = start_at + 1 / DISCORD_MAX_REQUESTS_PER_SECOND
+    if start_at > now:
+        time.sleep(start_at - now)
+    return SESSION.get(url, headers=headers, timeout=30, **kwargs)
+
+
+def _fetch_channel_messages(ch_id, after_snowflake, days_needed, headers):
+    """Count messages in a channel/thread from after_snowflake, bucketed by date."""
+    counts = Counter()
+    last_needed = max(days_needed)
+    messages_url = f"https://discord.com/api/v10/channels/{ch_id}/messages"
+    try:
+        after = str(after_snowflake)
+        while True:
+            resp = discord_get(messages_url, headers, params={"after": after, "limit": 100})
+            if resp.status_code == 403:
+                break
+            resp.raise_for_status()
+            msgs = orjson.loads(resp.content)
+            if not msgs:
+                break
+            for msg in msgs:
+                msg_date = date_from_snowflake(msg["id"])
+                if msg_date in days_needed:
+                    counts[msg_date] += 1
+            if len(msgs) < 100:
+                break
+            # Batches are not guaranteed oldest-first, so page from the newest
+            # ID and stop once even the oldest message is past every needed day.
+            msg_ids = [int(msg["id"]) for msg in msgs]
+            if date_from_snowflake(min(msg_ids)) > last_needed:
+                break
+            after = str(max(msg_ids))
+    except Exception:
+        pass
+    return counts
+
+
+def _fetch_archived_threads(ch_id, headers):
+    """Fetch public and private archived threads for a channel."""
+    thread_ids = []
+    for kind in ["public", "private"]:
+        url = f"https://discord.com/api/v10/channels/{ch_id}/threads/archived/{kind}"
+        try:
+            resp = discord_get(url, headers)
+            if resp.status_code == 403:
+                continue
+            resp.raise_for_status()
+            for t in orjson.loads(resp.content).get("threads", []):
+                thread_ids.append(t["id"])
+        except Exception:
+            continue
+    return thread_ids
 
 
 def fetch_discord_stats(guild_id, existing_entries, backfill_days=90):
@@ -369,9 +775,9 @@ def fetch_discord_stats(guild_id, existing_entries, backfill_days=90):
     # Fetch guild info with approximate member count
     url = f"https://discord.com/api/v10/guilds/{guild_id}?with_counts=true"
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
+        resp = discord_get(url, headers)
         resp.raise_for_status()
-        guild = resp.json()
+        guild = orjson.loads(resp.content)
     except Exception as e:
         print(f"  [ERROR] Discord guild fetch failed for {guild_id}: {e}")
         return None
@@ -382,13 +788,9 @@ def fetch_discord_stats(guild_id, existing_entries, backfill_days=90):
     # Determine which days need message data
     today = date.today()
     start_date = today - timedelta(days=backfill_days)
-    days_needed = set()
-    for d in range(backfill_days):
-        day = start_date + timedelta(days=d)
-        if day >= today:
-            break
-        if (day.isoformat(), name, "discord_messages") not in existing_entries:
-            days_needed.add(day)
+    window = {(start_date + timedelta(days=d)).isoformat() for d in range(backfill_days)}
+    recorded = existing_entries.get((name, "discord_messages"), {})
+    days_needed = {date.fromisoformat(day) for day in window.difference(recorded)}
 
     if not days_needed:
         print(f"  -> All message days already recorded")
@@ -397,9 +799,9 @@ def fetch_discord_stats(guild_id, existing_entries, backfill_days=90):
     # Fetch channels
     channels_url = f"https://discord.com/api/v10/guilds/{guild_id}/channels"
     try:
-        resp = requests.get(channels_url, headers=headers, timeout=30)
+        resp = discord_get(channels_url, headers)
         resp.raise_for_status()
-        channels = resp.json()
+        channels = orjson.loads(resp.content)
     except Exception as e:
         print(f"  [ERROR] Discord channels fetch failed: {e}")
         return {"name": name, "members": member_count, "messages_by_date": None}
@@ -410,51 +812,7 @@ def fetch_discord_stats(guild_id, existing_entries, backfill_days=90):
 
     text_channel_types = {0, 5}  # GUILD_TEXT and GUILD_ANNOUNCEMENT
     thread_types = {10, 11, 12}  # ANNOUNCEMENT_THREAD, PUBLIC_THREAD, PRIVATE_THREAD
-    messages_by_date = defaultdict(int)
-
-    def count_messages_in_channel(ch_id):
-        """Count messages in a channel/thread from after_snowflake, bucketed by date."""
-        messages_url = f"https://discord.com/api/v10/channels/{ch_id}/messages"
-        try:
-            after = str(after_snowflake)
-            while True:
-                resp = requests.get(
-                    messages_url,
-                    headers=headers,
-                    params={"after": after, "limit": 100},
-                    timeout=30,
-                )
-                if resp.status_code == 403:
-                    break
-                resp.raise_for_status()
-                msgs = resp.json()
-                if not msgs:
-                    break
-                for msg in msgs:
-                    msg_date = date_from_snowflake(msg["id"])
-                    if msg_date in days_needed:
-                        messages_by_date[msg_date] += 1
-                if len(msgs) < 100:
-                    break
-                after = msgs[-1]["id"]
-        except Exception:
-            pass
-
-    def fetch_archived_threads(ch_id):
-        """Fetch public and private archived threads for a channel."""
-        thread_ids = []
-        for kind in ["public", "private"]:
-            url = f"https://discord.com/api/v10/channels/{ch_id}/threads/archived/{kind}"
-            try:
-                resp = requests.get(url, headers=headers, timeout=30)
-                if resp.status_code == 403:
-                    continue
-                resp.raise_for_status()
-                for t in resp.json().get("threads", []):
-                    thread_ids.append(t["id"])
-            except Exception:
-                continue
-        return thread_ids
+    totals = Counter()
 
     # Collect all channel IDs to scan (text channels + threads)
     channel_ids = []
@@ -468,54 +826,75 @@ def fetch_discord_stats(guild_id, existing_entries, backfill_days=90):
 
     # Fetch active threads
     try:
-        resp = requests.get(
-            f"https://discord.com/api/v10/guilds/{guild_id}/threads/active",
-            headers=headers, timeout=30,
-        )
+        resp = discord_get(f"https://discord.com/api/v10/guilds/{guild_id}/threads/active", headers)
         if resp.status_code == 200:
-            for t in resp.json().get("threads", []):
+            for t in orjson.loads(resp.content).get("threads", []):
                 if t["id"] not in channel_ids:
                     channel_ids.append(t["id"])
     except Exception:
         pass
 
-    # Fetch archived threads from each text channel
-    for ch_id in text_channel_ids:
-        for t_id in fetch_archived_threads(ch_id):
-            if t_id not in channel_ids:
-                channel_ids.append(t_id)
+    with ThreadPoolExecutor(max_workers=DISCORD_MAX_WORKERS) as executor:
+        # Fetch archived threads from each text channel
+        thread_futures = [
+            executor.submit(_fetch_archived_threads, ch_id, headers) for ch_id in text_channel_ids
+        ]
+        for future in thread_futures:
+            for t_id in future.result():
+                if t_id not in channel_ids:
+                    channel_ids.append(t_id)
 
-    print(f"  -> Scanning {len(channel_ids)} channels/threads")
+        print(f"  -> Scanning {len(channel_ids)} channels/threads")
 
-    for ch_id in channel_ids:
-        count_messages_in_channel(ch_id)
+        futures = [
+            executor.submit(_fetch_channel_messages, ch_id, after_snowflake, days_needed, headers)
+            for ch_id in channel_ids
+        ]
+        for future in futures:
+            totals.update(future.result())
 
-    # Fill in zeros for days with no messages
-    for day in days_needed:
-        if day not in messages_by_date:
-            messages_by_date[day] = 0
+    # Days with no messages are recorded as zero
+    messages_by_date = {day: totals.get(day, 0) for day in days_needed}
 
-    return {"name": name, "members": member_count, "messages_by_date": dict(messages_by_date)}
+    return {"name": name, "members": member_count, "messages_by_date": messages_by_date}
 
 
 def append_rows(rows):
-    """Append rows to the CSV file, creating it with headers if needed."""
+    """Append (date, package, source, downloads) tuples to the CSV file.
+
+    Creates the file with headers if needed. The file is opened with a 1 MiB
+    buffer so large backfills are written in a few big chunks.
+    """
     os.makedirs(DATA_DIR, exist_ok=True)
     file_exists = os.path.exists(CSV_PATH)
-    with open(CSV_PATH, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
+    with open(CSV_PATH, "a", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
         if not file_exists:
-            writer.writeheader()
+            writer.writerow(CSV_HEADERS)
         writer.writerows(rows)
 
 
+def npm_start_date(existing, package, recency_start):
+    """Return the first day to request from npm, or None for a full backfill.
+
+    Only days after the last recorded one are new, but the recency window is
+    always re-requested so retroactive count corrections are picked up.
+    """
+    recorded = existing.get((package, "npm"))
+    if not recorded:
+        return None
+    next_day = date.fromisoformat(max(recorded)) + timedelta(days=1)
+    return min(next_day, recency_start)
+
+
 def main():
     config = load_config()
     existing = load_existing_data()
     new_rows = []
     csv_updates: Dict[tuple, int] = {}
 
-    recency_cutoff = (date.today() - timedelta(days=RECENCY_DAYS)).isoformat()
+    recency_start = date.today() - timedelta(days=RECENCY_DAYS)
+    recency_cutoff = recency_start.isoformat()
 
     pypi_packages = config.get("pypi", []) or []
     npm_packages = config.get("npm", []) or []
@@ -529,49 +908,49 @@ def main():
         f"{len(github_repos)} explicit GitHub repo(s)"
     )
 
-    for pkg in pypi_packages:
-        print(f"Fetching PyPI: {pkg}")
-        results = fetch_pypi_downloads(pkg)
+    print(f"Fetching {len(pypi_packages)} PyPI and {len(npm_packages)} npm package(s)")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pypi_futures = [executor.submit(fetch_pypi_downloads, pkg) for pkg in pypi_packages]
+        npm_futures = [
+            executor.submit(fetch_npm_downloads, pkg, npm_start_date(existing, pkg, recency_start))
+            for pkg in npm_packages
+        ]
+        pypi_results = [future.result() for future in pypi_futures]
+        npm_results = [future.result() for future in npm_futures]
+
+    for pkg, results in zip(pypi_packages, pypi_results):
+        print(f"PyPI: {pkg}")
+        seen = existing.get((pkg, "pypi"), {})
         added = updated = 0
         for result in results:
-            key = (result["date"], pkg, "pypi")
-            if key not in existing:
-                new_rows.append({
-                    "date": result["date"],
-                    "package": pkg,
-                    "source": "pypi",
-                    "downloads": result["downloads"],
-                })
+            day = result["date"]
+            if day not in seen:
+                new_rows.append((day, pkg, "pypi", result["downloads"]))
                 added += 1
-            elif result["date"] >= recency_cutoff and result["downloads"] != existing[key]:
-                csv_updates[key] = result["downloads"]
+            elif day >= recency_cutoff and result["downloads"] != seen[day]:
+                csv_updates[(day, pkg, "pypi")] = result["downloads"]
                 updated += 1
         print(f"  -> {len(results)} data points fetched, {added} new, {updated} updated")
 
-    for pkg in npm_packages:
-        print(f"Fetching npm: {pkg}")
-        results = fetch_npm_downloads(pkg)
+    for pkg, results in zip(npm_packages, npm_results):
+        print(f"npm: {pkg}")
+        seen = existing.get((pkg, "npm"), {})
         added = updated = 0
         for result in results:
-            key = (result["date"], pkg, "npm")
-            if key not in existing:
-                new_rows.append({
-                    "date": result["date"],
-                    "package": pkg,
-                    "source": "npm",
-                    "downloads": result["downloads"],
-                })
+            day = result["date"]
+            if day not in seen:
+                new_rows.append((day, pkg, "npm", result["downloads"]))
                 added += 1
-            elif result["date"] >= recency_cutoff and result["downloads"] != existing[key]:
-                csv_updates[key] = result["downloads"]
+            elif day >= recency_cutoff and result["downloads"] != seen[day]:
+                csv_updates[(day, pkg, "npm")] = result["downloads"]
                 updated += 1
         print(f"  -> {len(results)} data points fetched, {added} new, {updated} updated")
 
     github_rows = fetch_github_repo_stats(config)
     github_added = 0
     for row in github_rows:
-        key = (row["date"], row["package"], row["source"])
-        if key not in existing:
+        day, full_name, source, _ = row
+        if day not in existing.get((full_name, source), {}):
             new_rows.append(row)
             github_added += 1
     if github_rows:
@@ -585,40 +964,39 @@ def main():
         result = fetch_discord_stats(guild_id, existing)
         if result:
             # Total members (snapshot, recorded for today)
-            key = (today, result["name"], "discord_members")
-            if key not in existing:
-                new_rows.append({
-                    "date": today,
-                    "package": result["name"],
-                    "source": "discord_members",
-                    "downloads": result["members"],
-                })
+            if today not in existing.get((result["name"], "discord_members"), {}):
+                new_rows.append((today, result["name"], "discord_members", result["members"]))
                 print(f"  -> {result['name']}: {result['members']} total members")
             # Daily message counts
             if result["messages_by_date"] is not None:
+                seen = existing.get((result["name"], "discord_messages"), {})
                 msg_added = 0
                 for day, count in sorted(result["messages_by_date"].items()):
-                    key = (day.isoformat(), result["name"], "discord_messages")
-                    if key not in existing:
-                        new_rows.append({
-                            "date": day.isoformat(),
-                            "package": result["name"],
-                            "source": "discord_messages",
-                            "downloads": count,
-                        })
+                    if day.isoformat() not in seen:
+                        new_rows.append((day.isoformat(), result["name"], "discord_messages", count))
                         msg_added += 1
                 print(f"  -> {msg_added} days of message data added")
 
     if csv_updates:
-        rewrite_csv_with_updates(csv_updates)
+        rewrite_csv_with_updates(csv_updates, new_rows)
         print(f"\nUpdated {len(csv_updates)} existing entries in {CSV_PATH}")
+    elif new_rows:
+        append_rows(new_rows)
 
     if new_rows:
-        append_rows(new_rows)
         print(f"Appended {len(new_rows)} new entries to {CSV_PATH}")
 
     if not csv_updates and not new_rows:
         print("\nNo new data to append.")
+    else:
+        for (day, pkg, source), downloads in csv_updates.items():
+            existing[(pkg, source)][day] = downloads
+        for day, pkg, source, downloads in new_rows:
+            existing[(pkg, source)][day] = downloads
+        save_existing_index(existing)
+
+    # Keep the on-disk HTTP cache from growing run over run.
+    SESSION.cache.delete(expired=True)
 
     return 0
 
@@ -2,19 +2,21 @@
 """Generate trend plots from traction data."""
 
 import csv
+import hashlib
+import json
 import os
 import sys
+from bisect import bisect_left
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, timedelta
-
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+from operator import itemgetter
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CSV_PATH = os.path.join(ROOT_DIR, "data", "downloads.csv")
 PLOTS_DIR = os.path.join(ROOT_DIR, "plots")
+# Digest of the data behind each rendered PNG, used to skip unchanged plots.
+PLOT_HASHES_PATH = os.path.join(PLOTS_DIR, "hashes.json")
 
 # (label, days or None for all-time)
 TIME_WINDOWS = [
@@ -46,18 +48,31 @@ def load_data():
     if not os.path.exists(CSV_PATH):
         return series
     with open(CSV_PATH, newline="") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return series
+        di, pi, si, dli = (header.index(column) for column in ("date", "package", "source", "downloads"))
+        # Every series shares one date object per calendar day.
+        dates_by_iso = {}
         for row in reader:
-            key = (row["package"], row["source"])
-            d = date.fromisoformat(row["date"])
-            downloads = int(row["downloads"])
-            series[key].append((d, downloads))
-    # Sort each series by date
-    for key in series:
-        series[key].sort(key=lambda x: x[0])
+            iso = row[di]
+            d = dates_by_iso.get(iso)
+            if d is None:
+                d = dates_by_iso[iso] = date.fromisoformat(iso)
+            series[(row[pi], row[si])].append((d, int(row[dli])))
+    # Sort each series by date (dates are unique within a series)
+    for points in series.values():
+        points.sort()
     return series
 
 
+def points_since(points, cutoff):
+    """Return the date-sorted points on or after cutoff, via binary search."""
+    i = bisect_left(points, cutoff, key=itemgetter(0))
+    return points[i:] if i else points
+
+
 def filter_by_window(series, days):
     """Filter series to only include data within the last N days."""
     if days is None:
@@ -65,7 +80,7 @@ def filter_by_window(series, days):
     cutoff = date.today() - timedelta(days=days)
     filtered = {}
     for key, points in series.items():
-        pts = [(d, dl) for d, dl in points if d >= cutoff]
+        pts = points_since(points, cutoff)
         if pts:
             filtered[key] = pts
     return filtered
@@ -82,6 +97,11 @@ DOWNLOAD_TOTAL_SOURCES = {"pypi", "npm", "github_clones"}
 DOWNLOAD_TOTAL_LABEL = "PyPI + npm + GitHub clones"
 
 
+# Part of every plot digest; bump after changing plot styling so all plots are
+# redrawn on the next run.
+PLOT_STYLE_VERSION = 2
+
+
 def make_cumulative(points):
     """Convert a sorted list of (date, value) into cumulative (date, running_total)."""
     cumulative = []
@@ -92,12 +112,50 @@ def make_cumulative(points):
     return cumulative
 
 
-def generate_plots(all_series, window_label, window_name, days):
+def load_pyplot():
+    """Import matplotlib on first use; runs where every plot is unchanged never pay for it."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+    return plt, mdates
+
+
+def plot_digest(*parts):
+    """Return a short content hash of everything that determines a plot's pixels."""
+    payload = repr((PLOT_STYLE_VERSION,) + parts).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def load_plot_hashes():
+    """Load the {filename: digest} manifest of previously rendered plots."""
+    if not os.path.exists(PLOT_HASHES_PATH):
+        return {}
+    try:
+        with open(PLOT_HASHES_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_plot_hashes(plot_hashes):
+    with open(PLOT_HASHES_PATH, "w") as f:
+        json.dump(plot_hashes, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def generate_plots(all_series, window_label, window_name, days, plot_hashes=None):
     """Generate one PNG per source for a time window. Returns list of (source, path).
 
     For cumulative sources (pypi, npm), the cumulative total is computed from
     all available data, then the plot is windowed to the requested range.
+
+    plot_hashes maps filename → digest of the data last rendered there; plots
+    whose digest is unchanged (and whose file exists) are not redrawn, and the
+    mapping is updated for those that are.
     """
+    if plot_hashes is None:
+        plot_hashes = {}
     filtered = filter_by_window(all_series, days)
     if not filtered:
         print(f"  No data for {window_name}, skipping")
@@ -117,32 +175,44 @@ def generate_plots(all_series, window_label, window_name, days):
 
     os.makedirs(PLOTS_DIR, exist_ok=True)
     generated = []
+    rendered = 0
+    cutoff = date.today() - timedelta(days=days) if days else None
 
     for source in ordered_sources:
         source_series = grouped_by_source[source]
-        fig, ax = plt.subplots(figsize=(7, 4))
+        lines = []
 
         if source in CUMULATIVE_SOURCES:
             # Compute cumulative from full history, then filter to window
-            cutoff = date.today() - timedelta(days=days) if days else None
             for (pkg, src), _ in sorted(source_series.items()):
                 full_points = all_series.get((pkg, src), [])
                 cum_points = make_cumulative(full_points)
                 if cutoff:
-                    cum_points = [(d, v) for d, v in cum_points if d >= cutoff]
+                    cum_points = points_since(cum_points, cutoff)
                 if cum_points:
-                    dates = [p[0] for p in cum_points]
-                    values = [p[1] for p in cum_points]
-                    ax.plot(dates, values, marker="o", markersize=3, linewidth=1.5, label=pkg)
+                    lines.append((pkg, cum_points))
             ylabel = "Cumulative Messages" if source == "discord_messages" else "Cumulative Downloads"
         else:
             for (pkg, _), points in sorted(source_series.items()):
-                dates = [p[0] for p in points]
-                values = [p[1] for p in points]
-                ax.plot(dates, values, marker="o", markersize=3, linewidth=1.5, label=pkg)
+                lines.append((pkg, points))
             ylabel = "Value"
 
-        ax.set_title(f"{SOURCE_LABELS.get(source, source)} — {window_name}", fontsize=16, fontweight="bold")
+        title = f"{SOURCE_LABELS.get(source, source)} — {window_name}"
+        filename = f"{source}_{window_label}.png"
+        path = os.path.join(PLOTS_DIR, filename)
+        generated.append((source, filename))
+        digest = plot_digest(title, ylabel, lines)
+        if plot_hashes.get(filename) == digest and os.path.exists(path):
+            continue
+
+        plt, mdates = load_pyplot()
+        fig, ax = plt.subplots(figsize=(7, 4))
+        for pkg, points in lines:
+            dates = [p[0] for p in points]
+            values = [p[1] for p in points]
+            ax.plot(dates, values, marker="o", markersize=3, linewidth=1.5, label=pkg)
+
+        ax.set_title(title, fontsize=16, fontweight="bold")
         ax.set_xlabel("Date", fontsize=14)
         ax.set_ylabel(ylabel, fontsize=14)
         ax.legend(fontsize=14)
@@ -151,35 +221,52 @@ def generate_plots(all_series, window_label, window_name, days):
         ax.tick_params(axis="x", rotation=45, labelsize=14)
         ax.tick_params(axis="y", labelsize=14)
         plt.tight_layout()
-        filename = f"{source}_{window_label}.png"
-        path = os.path.join(PLOTS_DIR, filename)
         fig.savefig(path, dpi=150, bbox_inches="tight")
         plt.close(fig)
-        generated.append((source, filename))
+        plot_hashes[filename] = digest
+        rendered += 1
 
-    print(f"  {window_name}: saved {len(generated)} plots")
+    unchanged = len(generated) - rendered
+    print(f"  {window_name}: saved {rendered} plots, {unchanged} unchanged")
     return generated
 
 
+# Data shared with plot worker processes, set once per worker by _init_worker.
+_worker_series = None
+_worker_plot_hashes = None
+
+
+def _init_worker(series, plot_hashes):
+    global _worker_series, _worker_plot_hashes
+    _worker_series = series
+    _worker_plot_hashes = plot_hashes
+
+
+def render_window(window):
+    """Render one (label, name, days) entry of TIME_WINDOWS; returns updated plot hashes."""
+    label, name, days = window
+    plot_hashes = dict(_worker_plot_hashes)
+    generate_plots(_worker_series, label, name, days, plot_hashes)
+    return plot_hashes
+
+
 def update_readme(series):
     """Regenerate README.md with current plots and package table."""
     readme_path = os.path.join(ROOT_DIR, "README.md")
 
     # Build package table
-    packages = sorted(set(series.keys()))
     table_rows = []
     pkg_download_total = 0
-    for pkg, source in packages:
-        points = series[(pkg, source)]
+    for (pkg, source), points in sorted(series.items()):
         if source in SNAPSHOT_SOURCES:
             metric = "Latest Value"
             value = points[-1][1]
         elif source == "discord_messages":
             metric = "Total Messages"
-            value = sum(dl for _, dl in points)
+            value = sum(map(itemgetter(1), points))
         else:
             metric = "Total Downloads"
-            value = sum(dl for _, dl in points)
+            value = sum(map(itemgetter(1), points))
             if source in DOWNLOAD_TOTAL_SOURCES:
                 pkg_download_total += value
         table_rows.append(
@@ -238,6 +325,11 @@ Automated daily tracking of package and repository traction metrics from PyPI, n
 *Updated daily by [GitHub Actions](.github/workflows/update.yml). Edit [config.yaml](config.yaml) to add or remove packages.*
 """
 
+    if os.path.exists(readme_path):
+        with open(readme_path) as f:
+            if f.read() == readme:
+                print(f"  {readme_path} unchanged")
+                return
     with open(readme_path, "w") as f:
         f.write(readme)
     print(f"  Updated {readme_path}")
@@ -253,8 +345,17 @@ def main():
     print(f"Found data for {len(series)} package(s)")
 
     print("Generating plots...")
-    for label, name, days in TIME_WINDOWS:
-        generate_plots(series, label, name, days)
+    # Figure rendering and PNG encoding are CPU-bound and matplotlib is not
+    # thread-safe, so each time window is drawn in its own process.
+    workers = min(len(TIME_WINDOWS), os.cpu_count() or 1)
+    plot_hashes = load_plot_hashes()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(series, plot_hashes)
+    ) as executor:
+        window_hashes = list(executor.map(render_window, TIME_WINDOWS))
+    for hashes in window_hashes:
+        plot_hashes.update(hashes)
+    save_plot_hashes(plot_hashes)
 
     print("Updating README...")
     update_readme(series)